@@ -17,13 +17,16 @@ __all__ = [
     "left_join",
     "mutate",
     "mutate_row",
+    "mutate_numba",
     "pipeline",
+    "pipeline_par",
     "rename",
     "select",
     "summarize",
     "tail",
     "head",
     "to_csv",
+    "to_numpy_backend",
     "squeeze",
     "filter_index",
 ]
@@ -37,13 +40,16 @@ from viper.functions import (
     left_join,
     mutate,
     mutate_row,
+    mutate_numba,
     pipeline,
+    pipeline_par,
     rename,
     select,
     summarize,
     tail,
     head,
     to_csv,
+    to_numpy_backend,
     squeeze,
     filter_index,
 )
@@ -0,0 +1,155 @@
+"""Dask engine: applies the viper verbs to the partitions of a Dask DataFrame.
+
+Used by `pipeline(..., engine="dask")`, see `viper.functions.pipeline`.
+"""
+
+import os
+
+import dask.dataframe as dd
+import numpy as np
+import pandas as pd
+
+from viper.functions import (
+    MERGE_INDICATOR,
+    Verb,
+    _parse_aggregation,
+    _parse_sort_column,
+)
+
+# Aggregations that Dask cannot compute on sorted groups
+UNSUPPORTED_AGGREGATIONS = ["median", "nunique"]
+
+# Name of the column recording the position of the left rows in a partition, through the joins
+ROW_POSITION = "_viper_position"
+
+# Verbs processing each row independently, applied to each partition as they are
+PARTITION_VERBS = [
+    "select",
+    "filter",
+    "mutate",
+    "mutate_row",
+    "mutate_numba",
+    "rename",
+]
+
+
+def execute(data, funcs):
+    """Applies a sequence of verbs to the input data using Dask.
+
+    Args:
+        data (any): A Dask DataFrame, or a pandas DataFrame to be split into one partition per CPU.
+        funcs (list): The verbs and functions to apply to the input data.
+
+    Returns:
+        data (any): The result of applying all of the functions in the sequence to the input data, computed if the input data was a pandas DataFrame.
+    """
+    compute = not isinstance(data, dd.DataFrame)
+    result = dd.from_pandas(data, npartitions=os.cpu_count()) if compute else data
+    for func in funcs:
+        if isinstance(result, (dd.DataFrame, _Grouped)) and isinstance(func, Verb):
+            result = _apply(result, func)
+        else:
+            # Verbs returning pandas objects (e.g. head) end the Dask part of the pipeline
+            result = func(result)
+
+    if compute and hasattr(result, "compute"):
+        result = result.compute()
+    return result
+
+
+def _apply(ddf, verb):
+    if verb.name in PARTITION_VERBS:
+        return ddf.map_partitions(verb)
+    if verb.name not in VERBS:
+        raise NotImplementedError(
+            f"'{verb.name}' is not supported by the 'dask' engine."
+        )
+    return VERBS[verb.name](ddf, verb, *verb.args, **verb.kwargs)
+
+
+class _Grouped:
+    """A Dask DataFrame waiting for `summarize` to aggregate it by the grouping columns."""
+
+    def __init__(self, ddf, columns):
+        self.ddf = ddf
+        self.columns = columns
+
+
+def _group_by(ddf, verb, *columns):
+    return _Grouped(ddf, list(columns))
+
+
+def _summarize(df, verb, *aggregations):
+    if not isinstance(df, _Grouped):
+        raise NotImplementedError(
+            "'summarize' is only supported after 'group_by' by the 'dask' engine."
+        )
+    named_aggregations = {}
+    for aggregation in aggregations:
+        col, input_col, func_name = _parse_aggregation(aggregation)
+        if func_name in UNSUPPORTED_AGGREGATIONS:
+            raise NotImplementedError(
+                f"The '{func_name}' aggregation is not supported by the 'dask' engine."
+            )
+        if func_name == "size":
+            # The rows are counted with a grouping column, which always exists
+            input_col = df.columns[0]
+        named_aggregations[col] = pd.NamedAgg(column=input_col, aggfunc=func_name)
+    # Sort the groups like pandas does
+    return df.ddf.groupby(df.columns, sort=True).agg(**named_aggregations)
+
+
+def _arrange(ddf, verb, *columns, reblock=True):
+    by, ascending = map(list, zip(*map(_parse_sort_column, columns)))
+    return ddf.sort_values(by=by, ascending=ascending)
+
+
+def _distinct(ddf, verb, *columns, keep_all=False):
+    if keep_all:
+        return ddf.drop_duplicates(subset=list(columns))
+    return ddf[list(columns)].drop_duplicates()
+
+
+def _left_join(left, verb, right, by):
+    if not isinstance(right, dd.DataFrame):
+        # Each partition is joined with the whole right DataFrame
+        return left.map_partitions(_join_partition, verb)
+    return left.merge(right, on=by, how="left")
+
+
+def _join_partition(partition, verb):
+    # The rows keep the index of their left row, so that the divisions still match the data
+    positions = partition.assign(**{ROW_POSITION: np.arange(len(partition))})
+    result = verb(positions)
+    result.index = partition.index[result.pop(ROW_POSITION).to_numpy()]
+    return result
+
+
+def _anti_join(left, verb, right, by):
+    if not isinstance(right, dd.DataFrame):
+        return left.map_partitions(verb)
+    keys = [by] if isinstance(by, str) else list(by)
+    merged = left.merge(
+        right[keys].drop_duplicates(), on=keys, how="left", indicator=MERGE_INDICATOR
+    )
+    return merged[merged[MERGE_INDICATOR] == "left_only"].drop(columns=MERGE_INDICATOR)
+
+
+def _head(ddf, verb, n=5):
+    return ddf.head(n, npartitions=-1)
+
+
+def _tail(ddf, verb, n=6):
+    return ddf.tail(n)
+
+
+VERBS = {
+    "group_by": _group_by,
+    "summarize": _summarize,
+    "arrange": _arrange,
+    "distinct": _distinct,
+    "left_join": _left_join,
+    "anti_join": _anti_join,
+    "head": _head,
+    "tail": _tail,
+}
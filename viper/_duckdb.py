@@ -0,0 +1,327 @@
+"""DuckDB engine: lowers the viper verbs to a single SQL query.
+
+Used by `pipeline(..., engine="duckdb")`, see `viper.functions.pipeline`.
+"""
+
+import io
+import tokenize
+
+import duckdb
+import pandas as pd
+
+from viper.functions import (
+    ARROW_ATTR,
+    Verb,
+    _parse_aggregation,
+    _parse_mapping,
+    _parse_sort_column,
+)
+
+# SQL templates of the aggregation functions supported by summarize
+AGGREGATIONS = {
+    "count": "count({})",
+    "max": "max({})",
+    "mean": "avg({})",
+    "median": "median({})",
+    "min": "min({})",
+    "nunique": "count(DISTINCT {})",
+    "prod": "product({})",
+    "size": "count(*)",
+    "std": "stddev_samp({})",
+    "sum": "sum({})",
+    "var": "var_samp({})",
+}
+
+# Integer types, whose sums are cast back to the type of their column like in pandas, instead of being widened
+INTEGER_TYPES = [
+    "TINYINT",
+    "SMALLINT",
+    "INTEGER",
+    "BIGINT",
+    "UTINYINT",
+    "USMALLINT",
+    "UINTEGER",
+    "UBIGINT",
+]
+
+# Operators of the pandas eval syntax that SQL reads differently (e.g. // and % truncate), not compiled
+UNSUPPORTED_OPERATORS = ["//", "%", "&", "|", "~", "^", "**", "@"]
+
+# Name of the column numbering the rows, used to keep their order through joins and distinct
+ROW_NUMBER = "_viper_row"
+
+
+def execute(data, funcs):
+    """Applies a sequence of verbs to a pandas DataFrame using DuckDB.
+
+    The longest sequence of verbs that can be translated to SQL, starting from the first one, is compiled to a single query and executed by DuckDB; the functions following it are applied to the result with pandas.
+
+    Args:
+        data (pandas.DataFrame): The input DataFrame.
+        funcs (list): The verbs and functions to apply to the input DataFrame.
+
+    Returns:
+        data (any): The result of applying all of the functions in the sequence to the input data.
+    """
+    from viper.functions import pipeline
+
+    funcs = list(funcs)
+    compiler = DuckDBCompiler(data)
+    try:
+        compiled = compiler.compile(funcs)
+        if compiled:
+            data = compiler.execute(arrow=data.attrs.get(ARROW_ATTR, False))
+    finally:
+        compiler.close()
+    return pipeline(data, *funcs[compiled:], engine="pandas")
+
+
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _compilable(expression):
+    """Returns whether a string written for `DataFrame.eval` has the same meaning in SQL."""
+    try:
+        tokens = list(tokenize.generate_tokens(io.StringIO(expression).readline))
+    except (tokenize.TokenError, SyntaxError):
+        return False
+    for token in tokens:
+        if token.type in (tokenize.OP, tokenize.ERRORTOKEN) and (
+            token.string in UNSUPPORTED_OPERATORS or token.string == "`"
+        ):
+            return False
+        if token.type == tokenize.STRING and not token.string.startswith("'"):
+            # Double quotes delimit identifiers in SQL
+            return False
+    return True
+
+
+def _keys(by):
+    return [by] if isinstance(by, str) else list(by)
+
+
+def _matching(keys):
+    # Missing keys match each other, like in pandas
+    return " AND ".join(
+        f"l.{_quote(k)} IS NOT DISTINCT FROM r.{_quote(k)}" for k in keys
+    )
+
+
+class DuckDBCompiler:
+    """Translates viper verbs to a DuckDB SQL query over a DataFrame.
+
+    Each verb wraps the query built so far in a subquery, which DuckDB flattens when optimizing the final query.
+
+    Args:
+        data (pandas.DataFrame): The DataFrame the query reads from.
+    """
+
+    def __init__(self, data):
+        self.connection = duckdb.connect()
+        self.tables = 0
+        self.query = f"SELECT * FROM {self._register(data)}"
+
+    def _register(self, df):
+        # Registered DataFrames are scanned in place, without being copied
+        name = f"t{self.tables}"
+        self.tables += 1
+        self.connection.register(name, df)
+        return name
+
+    def _columns(self):
+        # Binding the query is enough to know its columns, it is not executed
+        return self.connection.sql(self.query).columns
+
+    def _types(self):
+        relation = self.connection.sql(self.query)
+        return dict(zip(relation.columns, map(str, relation.types)))
+
+    def compile(self, funcs):
+        """Compiles the longest supported sequence of verbs, starting from the first one.
+
+        Args:
+            funcs (list): The verbs and functions to compile.
+
+        Returns:
+            int: The number of verbs compiled into the query.
+        """
+        compiled = 0
+        while compiled < len(funcs):
+            consumed = self._compile(funcs[compiled:])
+            if not consumed:
+                break
+            compiled += consumed
+        return compiled
+
+    def _compile(self, funcs):
+        verb = funcs[0]
+        if not isinstance(verb, Verb):
+            return 0
+        if verb.name == "group_by":
+            # Grouping is only supported when immediately followed by its aggregations
+            following = funcs[1] if len(funcs) > 1 else None
+            if not isinstance(following, Verb) or following.name != "summarize":
+                return 0
+            query = self._group_by_summarize(verb.args, *following.args)
+            consumed = 2
+        else:
+            methods = {
+                "select": self._select,
+                "filter": self._filter,
+                "mutate": self._mutate,
+                "rename": self._rename,
+                "arrange": self._arrange,
+                "distinct": self._distinct,
+                "left_join": self._left_join,
+                "anti_join": self._anti_join,
+                "head": self._head,
+            }
+            if verb.name not in methods:
+                return 0
+            try:
+                query = methods[verb.name](*verb.args, **verb.kwargs)
+            except duckdb.Error:
+                return 0
+            consumed = 1
+        if query is None:
+            return 0
+        try:
+            # Binding the query checks that DuckDB understands it, without executing it
+            self.connection.sql(query)
+        except duckdb.Error:
+            return 0
+        self.query = query
+        return consumed
+
+    def execute(self, arrow=False):
+        """Executes the query.
+
+        Args:
+            arrow (bool, optional): Whether to return a DataFrame with Arrow-backed dtypes. Defaults to False.
+
+        Returns:
+            pandas.DataFrame: The result of the query.
+        """
+        relation = self.connection.sql(self.query)
+        if not arrow:
+            return relation.df()
+        result = relation.to_arrow_table().to_pandas(types_mapper=pd.ArrowDtype)
+        result.attrs[ARROW_ATTR] = True
+        return result
+
+    def close(self):
+        self.connection.close()
+
+    def _select(self, *columns):
+        if not columns:
+            return None
+        return f"SELECT {', '.join(map(_quote, columns))} FROM ({self.query}) AS t"
+
+    def _filter(self, *criteria):
+        if not all(isinstance(c, str) and _compilable(c) for c in criteria):
+            return None
+        if not criteria:
+            return self.query
+        condition = " AND ".join(f"({criterion})" for criterion in criteria)
+        return f"SELECT * FROM ({self.query}) AS t WHERE {condition}"
+
+    def _mutate(self, /, **transformations):
+        if not all(
+            isinstance(t, str) and _compilable(t) for t in transformations.values()
+        ):
+            return None
+        query = self.query
+        for new_column, expression in transformations.items():
+            columns = self.connection.sql(query).columns
+            if new_column in columns:
+                projection = f"* REPLACE (({expression}) AS {_quote(new_column)})"
+            else:
+                projection = f"*, ({expression}) AS {_quote(new_column)}"
+            query = f"SELECT {projection} FROM ({query}) AS t"
+        return query
+
+    def _rename(self, *mappings):
+        name_map = dict(_parse_mapping(mapping) for mapping in mappings)
+        projection = ", ".join(
+            f"{_quote(c)} AS {_quote(name_map.get(c, c))}" for c in self._columns()
+        )
+        return f"SELECT {projection} FROM ({self.query}) AS t"
+
+    def _arrange(self, *columns, reblock=True):
+        order = ", ".join(
+            f"{_quote(column)} {'ASC' if ascending else 'DESC'} NULLS LAST"
+            for column, ascending in map(_parse_sort_column, columns)
+        )
+        # Ties keep their original order, as the sort of pandas is stable
+        return (
+            f"SELECT * EXCLUDE ({ROW_NUMBER}) FROM ({self._numbered()}) AS t "
+            f"ORDER BY {order}, {ROW_NUMBER}"
+        )
+
+    def _numbered(self):
+        return (
+            f"SELECT *, row_number() OVER () AS {ROW_NUMBER} FROM ({self.query}) AS t"
+        )
+
+    def _distinct(self, *columns, keep_all=False):
+        if not columns:
+            return None
+        # Keep the first row of each group of duplicates, in their original order
+        projection = (
+            f"* EXCLUDE ({ROW_NUMBER})" if keep_all else ", ".join(map(_quote, columns))
+        )
+        return (
+            f"SELECT {projection} FROM ({self._numbered()}) AS t "
+            f"QUALIFY row_number() OVER (PARTITION BY {', '.join(map(_quote, columns))} "
+            f"ORDER BY {ROW_NUMBER}) = 1 ORDER BY {ROW_NUMBER}"
+        )
+
+    def _group_by_summarize(self, columns, *aggregations):
+        if not columns:
+            return None
+        projection = [_quote(c) for c in columns]
+        types = self._types()
+        for aggregation in aggregations:
+            col, input_col, func_name = _parse_aggregation(aggregation)
+            if func_name not in AGGREGATIONS:
+                return None
+            expression = AGGREGATIONS[func_name].format(_quote(input_col))
+            if func_name == "sum" and types.get(input_col) in INTEGER_TYPES:
+                expression = f"CAST({expression} AS {types[input_col]})"
+            projection.append(f"{expression} AS {_quote(col)}")
+        keys = ", ".join(map(_quote, columns))
+        # Drop the groups with missing keys and sort the others, like pandas does
+        condition = " AND ".join(f"{_quote(c)} IS NOT NULL" for c in columns)
+        return (
+            f"SELECT {', '.join(projection)} FROM ({self.query}) AS t "
+            f"WHERE {condition} GROUP BY {keys} ORDER BY {keys}"
+        )
+
+    def _left_join(self, right, by):
+        keys = _keys(by)
+        if not isinstance(right, pd.DataFrame):
+            return None
+        if (set(self._columns()) & set(right.columns)) - set(keys):
+            # pandas would add suffixes to the overlapping columns
+            return None
+        projection = [f"l.* EXCLUDE ({ROW_NUMBER})"] + [
+            f"r.{_quote(c)}" for c in right.columns if c not in keys
+        ]
+        return (
+            f"SELECT {', '.join(projection)} FROM ({self._numbered()}) AS l "
+            f"LEFT JOIN {self._register(right)} AS r ON {_matching(keys)} "
+            f"ORDER BY l.{ROW_NUMBER}"
+        )
+
+    def _anti_join(self, right, by):
+        if not isinstance(right, pd.DataFrame):
+            return None
+        return (
+            f"SELECT * EXCLUDE ({ROW_NUMBER}) FROM ({self._numbered()}) AS l "
+            f"ANTI JOIN {self._register(right)} AS r ON {_matching(_keys(by))} "
+            f"ORDER BY {ROW_NUMBER}"
+        )
+
+    def _head(self, n=5):
+        return f"SELECT * FROM ({self.query}) AS t LIMIT {int(n)}"
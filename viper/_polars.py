@@ -0,0 +1,329 @@
+"""Polars engine: translates the viper verbs to their Polars equivalents.
+
+Used by `pipeline(..., engine="polars")`, see `viper.functions.pipeline`.
+"""
+
+import ast
+import io
+import operator
+import re
+import tokenize
+
+import polars as pl
+
+from viper.functions import (
+    Verb,
+    _parse_aggregation,
+    _parse_mapping,
+    _parse_sort_column,
+)
+
+
+def execute(data, funcs, lazy=False):
+    """Applies a sequence of verbs to the input data using Polars.
+
+    Args:
+        data (any): A Polars DataFrame or LazyFrame, or a pandas DataFrame to be converted.
+        funcs (list): The verbs and functions to apply to the input data.
+        lazy (bool, optional): Whether to run the verbs on a LazyFrame and collect the result at the end. Defaults to False.
+
+    Returns:
+        data (any): The result of applying all of the functions in the sequence to the input data.
+    """
+    if not isinstance(data, (pl.DataFrame, pl.LazyFrame)):
+        data = pl.from_pandas(data)
+
+    collect = lazy and isinstance(data, pl.DataFrame)
+    result = data.lazy() if collect else data
+    for func in funcs:
+        if isinstance(func, Verb):
+            if func.name not in VERBS:
+                raise NotImplementedError(
+                    f"'{func.name}' is not supported by the 'polars' engine."
+                )
+            result = VERBS[func.name](result, *func.args, **func.kwargs)
+        else:
+            result = func(result)
+
+    if collect and isinstance(result, pl.LazyFrame):
+        result = result.collect()
+    return result
+
+
+class _Columns:
+    """Stand-in for the DataFrame passed to `filter` and `mutate` lambdas, building `pl.col` expressions."""
+
+    def __getitem__(self, name):
+        return pl.col(name)
+
+    def __getattr__(self, name):
+        return pl.col(name)
+
+
+_COLUMNS = _Columns()
+
+
+def _expression(value):
+    if isinstance(value, pl.Expr):
+        return value
+    if isinstance(value, str):
+        return _parse_expression(value)
+    return value(_COLUMNS)
+
+
+# Operators of the pandas eval syntax, applied to Polars expressions with the same semantics
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+UNARY_OPERATORS = {
+    ast.Not: operator.invert,
+    ast.Invert: operator.invert,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+COMPARISON_OPERATORS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+
+
+def _parse_expression(expression):
+    """Translates a string criterion or transformation, written for `DataFrame.eval`, to a Polars expression."""
+    # Backtick-quoted column names are replaced by identifiers, like pandas does
+    names = {}
+
+    def quoted(match):
+        names[f"_viper_column_{len(names)}"] = match.group(1)
+        return f"_viper_column_{len(names) - 1}"
+
+    source = re.sub(r"`([^`]*)`", quoted, expression)
+    try:
+        # As in pandas, & and | have the precedence of the boolean operators, lower than the comparisons
+        tokens = [
+            (
+                (tokenize.NAME, {"&": "and", "|": "or"}[token.string])
+                if token.type == tokenize.OP and token.string in ("&", "|")
+                else (token.type, token.string)
+            )
+            for token in tokenize.generate_tokens(io.StringIO(source).readline)
+        ]
+        tree = ast.parse(tokenize.untokenize(tokens).strip(), mode="eval")
+        return _translate(tree.body, names)
+    except (SyntaxError, tokenize.TokenError, NotImplementedError):
+        raise NotImplementedError(
+            f"The expression {expression!r} is not supported by the 'polars' engine, "
+            "use a lambda function building Polars expressions instead."
+        ) from None
+
+
+def _translate(node, names):
+    if isinstance(node, ast.Name):
+        return pl.col(names.get(node.id, node.id))
+    if isinstance(node, ast.Constant):
+        return pl.lit(node.value)
+    if isinstance(node, ast.BoolOp):
+        combine = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+        values = [_translate(value, names) for value in node.values]
+        result = values[0]
+        for value in values[1:]:
+            result = combine(result, value)
+        return result
+    if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+        return UNARY_OPERATORS[type(node.op)](_translate(node.operand, names))
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+        return BINARY_OPERATORS[type(node.op)](
+            _translate(node.left, names), _translate(node.right, names)
+        )
+    if isinstance(node, ast.Compare):
+        # Chained comparisons (e.g. 1 < x < 2) are combined with a logical AND
+        result = None
+        left = node.left
+        for op, right in zip(node.ops, node.comparators):
+            comparison = _compare(op, left, right, names)
+            result = comparison if result is None else result & comparison
+            left = right
+        return result
+    raise NotImplementedError
+
+
+def _compare(op, left, right, names):
+    if isinstance(op, (ast.In, ast.NotIn)):
+        if not isinstance(right, (ast.List, ast.Tuple)) or not all(
+            isinstance(element, ast.Constant) for element in right.elts
+        ):
+            raise NotImplementedError
+        result = _translate(left, names).is_in(
+            [element.value for element in right.elts]
+        )
+        return ~result if isinstance(op, ast.NotIn) else result
+    if type(op) not in COMPARISON_OPERATORS:
+        raise NotImplementedError
+    return COMPARISON_OPERATORS[type(op)](
+        _translate(left, names), _translate(right, names)
+    )
+
+
+class _Grouped:
+    """A frame waiting for `summarize` to aggregate it by the grouping columns."""
+
+    def __init__(self, df, columns):
+        self.df = df
+        self.columns = columns
+
+
+def _select(df, *columns):
+    return df.select(list(columns))
+
+
+def _filter(df, *criteria):
+    if not criteria:
+        return df
+    return df.filter(*(_expression(criterion) for criterion in criteria))
+
+
+def _rename(df, *mappings):
+    return df.rename(dict(_parse_mapping(mapping) for mapping in mappings))
+
+
+def _arrange(df, *columns, reblock=True):
+    # The memory layout is managed by Polars, reblock only applies to pandas
+    by, ascending = zip(*map(_parse_sort_column, columns)) if columns else ((), ())
+    return df.sort(
+        by=list(by),
+        descending=[not asc for asc in ascending],
+        nulls_last=True,
+        maintain_order=True,
+    )
+
+
+def _mutate(df, /, **transformations):
+    # One step per transformation, so that each one can use the columns created before it
+    for new_column, transformation in transformations.items():
+        df = df.with_columns(_expression(transformation).alias(new_column))
+    return df
+
+
+def _distinct(df, *columns, keep_all=False):
+    if keep_all:
+        return df.unique(subset=list(columns), keep="first", maintain_order=True)
+    return df.select(list(columns)).unique(keep="first", maintain_order=True)
+
+
+def _group_by(df, *columns):
+    return _Grouped(df, list(columns))
+
+
+# Aggregations whose Polars name differs from the pandas one
+RENAMED_AGGREGATIONS = {
+    "prod": "product",
+}
+
+
+def _aggregation(aggregation):
+    col, input_col, func_name = _parse_aggregation(aggregation)
+    if func_name == "size":
+        return pl.len().alias(col)
+    if func_name == "nunique":
+        # Unlike pandas, Polars counts the missing values as a distinct value
+        return pl.col(input_col).drop_nulls().n_unique().alias(col)
+    func_name = RENAMED_AGGREGATIONS.get(func_name, func_name)
+    return getattr(pl.col(input_col), func_name)().alias(col)
+
+
+def _summarize(df, *aggregations):
+    expressions = [_aggregation(aggregation) for aggregation in aggregations]
+    if isinstance(df, _Grouped):
+        # Drop the groups with missing keys and sort the others, like pandas does
+        grouped = df.df.drop_nulls(subset=df.columns).group_by(df.columns)
+        return grouped.agg(expressions).sort(df.columns)
+    return df.select(expressions)
+
+
+def _like(right, left):
+    """Converts the right frame of a join to the same kind of frame as the left one."""
+    if not isinstance(right, (pl.DataFrame, pl.LazyFrame)):
+        right = pl.from_pandas(right)
+    if isinstance(left, pl.LazyFrame):
+        return right.lazy()
+    if isinstance(right, pl.LazyFrame):
+        return right.collect()
+    return right
+
+
+def _left_join(left, right, by):
+    return left.join(_like(right, left), on=by, how="left")
+
+
+def _anti_join(left, right, by):
+    return left.join(_like(right, left), on=by, how="anti")
+
+
+def _tail(df, n=6):
+    return df.tail(n)
+
+
+def _head(df, n=5):
+    return df.head(n)
+
+
+# Options of pandas.DataFrame.to_csv and their names in polars.DataFrame.write_csv
+CSV_OPTIONS = {
+    "sep": "separator",
+    "header": "include_header",
+    "na_rep": "null_value",
+    "quotechar": "quote_char",
+    "lineterminator": "line_terminator",
+}
+
+
+def _to_csv(df, filename, index=False, engine="pandas", **kwargs):
+    # Polars always uses its own CSV writer
+    if index:
+        raise NotImplementedError(
+            "'to_csv' with index=True is not supported by the 'polars' engine."
+        )
+    unsupported = set(kwargs) - set(CSV_OPTIONS)
+    if "header" in kwargs and not isinstance(kwargs["header"], bool):
+        # Polars cannot write column aliases
+        unsupported.add("header")
+    if unsupported:
+        raise NotImplementedError(
+            "Unsupported 'to_csv' options for the 'polars' engine: "
+            f"{', '.join(map(repr, sorted(unsupported)))}."
+        )
+    options = {CSV_OPTIONS[key]: value for key, value in kwargs.items()}
+
+    if isinstance(df, pl.LazyFrame):
+        # Execute the plan once, and keep working on its result
+        frame = df.collect()
+        frame.write_csv(filename, **options)
+        return frame.lazy()
+    df.write_csv(filename, **options)
+    return df
+
+
+VERBS = {
+    "select": _select,
+    "filter": _filter,
+    "rename": _rename,
+    "arrange": _arrange,
+    "mutate": _mutate,
+    "distinct": _distinct,
+    "group_by": _group_by,
+    "summarize": _summarize,
+    "left_join": _left_join,
+    "anti_join": _anti_join,
+    "tail": _tail,
+    "head": _head,
+    "to_csv": _to_csv,
+}
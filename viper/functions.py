@@ -1,19 +1,278 @@
-def pipeline(data, *funcs):
+import functools
+import inspect
+import os
+import sys
+import types
+import warnings
+import weakref
+
+import numpy as np
+import pandas as pd
+
+ENGINES = ["auto", "pandas", "polars", "duckdb", "dask"]
+
+# DataFrame.attrs key marking the DataFrames converted to Arrow-backed dtypes by pipeline(arrow=True)
+ARROW_ATTR = "_viper_arrow"
+
+# Below this number of rows in the right DataFrame, anti_join on a single column uses isin instead of a merge
+ISIN_MAX_ROWS = 10_000
+
+# Name of the merge indicator column used by anti_join
+MERGE_INDICATOR = "_viper_merge"
+
+# Aggregation functions supported by summarize, all implemented by pandas without Python-level loops
+AGGREGATIONS = [
+    "count",
+    "first",
+    "last",
+    "max",
+    "mean",
+    "median",
+    "min",
+    "nunique",
+    "prod",
+    "size",
+    "std",
+    "sum",
+    "var",
+]
+
+# Minimum number of columns from which arrange and summarize check the memory layout of their result
+REBLOCK_MIN_COLUMNS = 8
+
+# Options of DataFrame.to_csv supported by the pyarrow CSV writer, with their name in pyarrow.csv.WriteOptions
+PYARROW_CSV_OPTIONS = {"sep": "delimiter", "header": "include_header"}
+
+# Number of rows formatted at once by the pyarrow CSV writer
+PYARROW_CSV_BATCH_SIZE = 65_536
+
+# Extensions of the files compressed by DataFrame.to_csv with a method not available in to_csv(engine="pyarrow")
+PANDAS_COMPRESSION_EXTENSIONS = (
+    ".bz2",
+    ".tar",
+    ".tar.bz2",
+    ".tar.gz",
+    ".tar.xz",
+    ".tgz",
+    ".xz",
+    ".zip",
+    ".zst",
+)
+
+# Verbs working on whole columns, whose consecutive runs are executed as a single stage
+FUSABLE_VERBS = ["select", "filter", "mutate"]
+
+
+class Verb:
+    """A step of a pipeline, as returned by the viper verbs (`select`, `filter`, ...).
+
+    A verb is called with a pandas DataFrame, just like a lambda function, and also records its name and the arguments it was created with, so that `pipeline` can translate it for engines other than pandas.
+
+    Args:
+        name (str): The name of the verb (e.g. 'select').
+        func (function): The function applying the verb to a pandas DataFrame.
+        args (tuple, optional): The positional arguments the verb was created with.
+        kwargs (dict, optional): The keyword arguments the verb was created with.
+        is_noop (bool, optional): Whether the verb returns its input unchanged (e.g. `rename()` without mappings), so that `pipeline` can skip it. Defaults to False.
+    """
+
+    __slots__ = ("name", "func", "args", "kwargs", "is_noop")
+
+    def __init__(self, name, func, args=(), kwargs=None, is_noop=False):
+        self.name = name
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs if kwargs is not None else {}
+        self.is_noop = is_noop
+
+    def __call__(self, df):
+        return self.func(df)
+
+    def __repr__(self):
+        return f"Verb({self.name!r}, args={self.args!r}, kwargs={self.kwargs!r})"
+
+
+def pipeline(data, *funcs, engine="auto", lazy=False, arrow=False):
     """Applies a sequence of functions to the input data, in the order they are provided.
 
+    With the 'pandas' engine, consecutive `select`, `filter` and `mutate` verbs are fused into a single stage: the columns selected by `select` are taken together with the rows matching the criteria of the next `filter`, in a single step, right before the next `filter` or `mutate` or at the end of the stage.
+
+    With the 'polars' engine, the viper verbs are translated to their Polars equivalents; any other function is called with the Polars frame as-is. Requires the `polars` package.
+
+    With the 'duckdb' engine, the verbs are compiled to a single SQL query executed by DuckDB on the input pandas DataFrame. Only string criteria and transformations can be compiled, when they mean the same in SQL (e.g. not with `//`, `%`, `&`, `|` or `~`), and the result has a default index, with the group keys as columns; compilation stops at the first verb that is not supported, and the remaining functions are applied to the result with pandas. Requires the `duckdb` package.
+
+    With the 'dask' engine, the verbs that work on each row independently (e.g. `select`, `filter`, `mutate`) are applied to each partition of a Dask DataFrame, while `group_by` and `summarize`, `arrange`, `distinct` and the joins with Dask DataFrames use the Dask implementations. pandas DataFrames are split into one partition per CPU, and the result is computed; Dask DataFrames stay lazy. Requires the `dask` package.
+
     Args:
         data (any): The input data to be processed.
         *funcs (function): A variable number of functions to be applied to the input data.
+        engine (str, optional): The engine executing the verbs. Can be 'pandas', 'polars', 'duckdb', 'dask' or 'auto', which uses 'polars' when `data` is a Polars DataFrame or LazyFrame, 'dask' when it is a Dask DataFrame and 'pandas' otherwise. Defaults to 'auto'.
+        lazy (bool, optional): Whether to run the verbs on a Polars LazyFrame, collecting the result only once at the end so that Polars can optimize the whole query. Only supported by the 'polars' engine. Defaults to False.
+        arrow (bool, optional): Whether to convert a pandas DataFrame to Arrow-backed dtypes before applying the functions, which reduces memory usage and speeds up most verbs, especially on string columns. Use `to_numpy_backend` to convert the result back. Requires the `pyarrow` package. Defaults to False.
 
     Returns:
         data (any): The result of applying all of the functions in the sequence to the input data.
     """
+    # Verbs without any effect (e.g. a filter without criteria) are left out of the pipeline
+    funcs = [func for func in funcs if not getattr(func, "is_noop", False)]
+    if engine not in ENGINES:
+        raise ValueError(
+            f"Invalid engine. Must be one of {', '.join(map(repr, ENGINES))}."
+        )
+    if engine == "auto":
+        engine = {"polars": "polars", "dask": "dask"}.get(_package(data), "pandas")
+    if arrow and isinstance(data, pd.DataFrame):
+        data = _to_arrow_backend(data)
+
+    if engine == "polars":
+        from viper import _polars
+
+        return _polars.execute(data, funcs, lazy=lazy)
+
+    if lazy:
+        raise ValueError("Lazy execution is only supported by the 'polars' engine.")
+
+    if engine == "duckdb":
+        from viper import _duckdb
+
+        return _duckdb.execute(data, funcs)
+
+    if engine == "dask":
+        from viper import _dask
+
+        return _dask.execute(data, funcs)
+
     result = data
-    for func in funcs:
+    for func in _fuse(funcs):
         result = func(result)
     return result
 
 
+def pipeline_par(data, *branches, scheduler="processes", num_workers=None):
+    """Applies several sequences of functions to the same input data, running them in parallel.
+
+    Each branch is executed by `pipeline` as a Dask delayed task, and all the branches are computed together, so that independent results (e.g. different summaries of the same DataFrame) use all the available cores. Requires the `dask` package.
+
+    Args:
+        data (any): The input data, shared by all the branches. Each branch works on its own shallow copy of a pandas DataFrame, so that the columns added by one branch are not visible to the others.
+        *branches (tuple): The branches to run, each one a sequence of functions to be applied to the input data by `pipeline`.
+        scheduler (str, optional): The Dask scheduler running the branches, e.g. 'processes' or 'threads'. Defaults to 'processes'.
+        num_workers (int, optional): The number of workers running the branches. Defaults to the number of CPUs.
+
+    Returns:
+        tuple: The results of the branches, in the order they are provided.
+    """
+    import dask
+
+    # A single task holds the input data, shared by the branches
+    source = dask.delayed(data)
+    branches = [dask.delayed(_run_branch)(source, branch) for branch in branches]
+    return dask.compute(
+        *branches,
+        scheduler=scheduler,
+        num_workers=num_workers or os.cpu_count(),
+    )
+
+
+def _run_branch(data, branch):
+    # Verbs like mutate modify their input in place
+    if isinstance(data, pd.DataFrame):
+        data = data.copy(deep=False)
+    return pipeline(data, *branch)
+
+
+def _package(data):
+    """Returns the name of the top-level package defining the type of the data, without importing it."""
+    return type(data).__module__.split(".")[0]
+
+
+def _to_arrow_backend(df):
+    """Converts a DataFrame to Arrow-backed dtypes, unless it has already been converted by viper."""
+    if df.attrs.get(ARROW_ATTR):
+        return df
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError("The pyarrow package is required when arrow=True.") from e
+    result = df.convert_dtypes(dtype_backend="pyarrow")
+    result.attrs[ARROW_ATTR] = True
+    return result
+
+
+def _fuse(funcs):
+    """Replaces the runs of consecutive fusable verbs with single verbs executing them in one stage."""
+    fused = []
+    run = []
+    for func in (*funcs, None):
+        if isinstance(func, Verb) and func.name in FUSABLE_VERBS:
+            run.append(func)
+            continue
+        if len(run) > 1:
+            steps = tuple(run)
+            fused.append(
+                Verb("fused", functools.partial(_run_fused, steps=steps), args=steps)
+            )
+        else:
+            fused.extend(run)
+        run = []
+        if func is not None:
+            fused.append(func)
+    return fused
+
+
+def _run_fused(df, steps):
+    """Executes a run of `select`, `filter` and `mutate` verbs on a DataFrame.
+
+    The criteria of a filter and the pending projection are applied together, with a single take, only when the next `select`, `filter` or `mutate` needs the intermediate DataFrame or at the end of the run. Likewise, the transformations of consecutive `mutate` verbs are applied together, so that their string expressions are evaluated in a single call.
+    """
+    criteria = []
+    columns = None
+    transformations = []
+    for verb in steps:
+        if verb.name == "mutate":
+            df = _take(df, criteria, columns)
+            criteria = []
+            columns = None
+            transformations.extend(verb.kwargs.items())
+            continue
+        df = _apply_transformations(df, transformations)
+        transformations = []
+        if verb.name == "select":
+            if columns is not None:
+                # The columns must be selected from the previous projection
+                df = _take(df, criteria, columns)
+                criteria = []
+            columns = list(verb.args)
+        else:
+            # Each filter is evaluated on the rows kept by the previous ones
+            df = _take(df, criteria, columns)
+            columns = None
+            criteria = list(verb.args)
+    df = _apply_transformations(df, transformations)
+    return _take(df, criteria, columns)
+
+
+def _take(df, criteria, columns):
+    """Selects the rows matching the criteria and the columns of a DataFrame, in a single step."""
+    if criteria:
+        mask = _filter_mask(df, criteria)
+        return df.loc[mask, columns] if columns is not None else df[mask]
+    if columns is not None:
+        return df[columns]
+    return df
+
+
+def _stacklevel():
+    """Returns the stacklevel of the first frame outside of viper, for warnings."""
+    package_dir = os.path.dirname(__file__)
+    frame = sys._getframe(1)
+    level = 1
+    while frame is not None and frame.f_code.co_filename.startswith(package_dir):
+        frame = frame.f_back
+        level += 1
+    return level
+
+
 def select(*columns):
     """Returns a lambda function that can be used to select the specified columns from a pandas DataFrame.
 
@@ -23,31 +282,88 @@ def select(*columns):
     Returns:
         function: A lambda function that takes a DataFrame as input and returns a new DataFrame containing only the selected columns.
     """
-    return lambda df: df[list(columns)]
+    return Verb(
+        "select", functools.partial(_select, columns=list(columns)), args=columns
+    )
+
+
+def _select(df, columns):
+    return df[columns]
 
 
 def filter(*criteria):
     """
     Filters a Pandas DataFrame based on the specified criteria.
 
+    Each criterion is called once with the entire DataFrame and must return a boolean Series (or array) with one value per row, e.g. `lambda df: df["hp"] > 100`. The resulting masks are combined with a logical AND.
+
+    Criteria can also be strings, evaluated with `DataFrame.eval` (e.g. `"hp > 100 and wt < 3"`); local variables are not available in the expressions.
+
+    The criteria of a single `filter` are all evaluated on the same DataFrame, so they should not depend on the rows removed by each other (e.g. `df["hp"] > df["hp"].mean()`): use consecutive `filter` verbs instead, each one being evaluated on the rows kept by the previous one.
+
+    Row-level criteria (e.g. `lambda r: "Merc" in r["model"]`) are still supported but deprecated: they are detected when the call on the whole DataFrame raises, or does not return one value per row, and are then applied row by row with a `DeprecationWarning`.
+
     Args:
-        *criteria: A list of lambda functions that specify the filtering criteria.
+        *criteria: A list of lambda functions or strings that specify the filtering criteria.
 
     Returns:
         A filtered Pandas DataFrame.
     """
 
-    def _filter(df):
-        # Combine the filtering criteria using the apply method
-        combined_criteria = df.apply(
-            lambda row: all(criteria[i](row) for i in range(len(criteria))),
-            axis=1,
+    return Verb(
+        "filter",
+        functools.partial(_filter, criteria=criteria),
+        args=criteria,
+        is_noop=not criteria,
+    )
+
+
+def _filter(df, criteria):
+    if not criteria:
+        return df
+    # Return the filtered DataFrame
+    return df[_filter_mask(df, criteria)]
+
+
+def _filter_mask(df, criteria):
+    """Evaluates the filtering criteria on a DataFrame and combines them into a single boolean mask."""
+    if not criteria:
+        return np.ones(len(df), dtype=bool)
+
+    masks = []
+    expressions = [c for c in criteria if isinstance(c, str)]
+    if expressions:
+        # A single evaluation for all the string criteria
+        expression = " and ".join(f"({e})" for e in expressions)
+        masks.append(
+            _as_mask(df.eval(expression, engine=_eval_engine(df), local_dict={}))
         )
 
-        # Return the filtered DataFrame
-        return df[combined_criteria]
+    for criterion in criteria:
+        if isinstance(criterion, str):
+            continue
+        try:
+            mask = criterion(df)
+        except Exception:
+            mask = None
+        if mask is None or np.ndim(mask) == 0 or len(mask) != len(df):
+            warnings.warn(
+                "Row-level filter criteria are deprecated, write criteria that operate on the "
+                "entire DataFrame instead (e.g. `lambda df: df['x'] > 0`).",
+                DeprecationWarning,
+                stacklevel=_stacklevel(),
+            )
+            mask = df.apply(criterion, axis=1) if len(df) else np.zeros(0, dtype=bool)
+        masks.append(_as_mask(mask))
+
+    return np.logical_and.reduce(masks)
+
 
-    return _filter
+def _as_mask(mask):
+    """Converts the result of a criterion to a NumPy boolean array, treating missing values as False."""
+    if isinstance(mask, pd.Series) and mask.hasnans:
+        mask = mask.fillna(False)
+    return np.asarray(mask, dtype=bool)
 
 
 def rename(*mappings):
@@ -62,56 +378,129 @@ def rename(*mappings):
             with the specified column name mappings applied.
     """
 
-    def parse_mapping(
-        mapping,
-    ):
-        (
-            old_name,
-            new_name,
-        ) = mapping.split(" = ")
-        return (
-            old_name,
-            new_name,
-        )
+    name_map = dict(_parse_mapping(mapping) for mapping in mappings)
+    return Verb(
+        "rename",
+        functools.partial(_rename, name_map=name_map),
+        args=mappings,
+        is_noop=not name_map,
+    )
+
+
+def _rename(df, name_map):
+    if not name_map:
+        return df
+    columns = df.columns
+    if isinstance(columns, pd.MultiIndex):
+        return df.rename(columns=name_map)
+    if not set(name_map).intersection(columns):
+        return df
+    # A shallow copy shares the data with the input, only the column labels are replaced
+    result = df.copy(deep=False)
+    result.columns = [name_map.get(c, c) for c in columns]
+    return result
 
-    name_map = dict(parse_mapping(mapping) for mapping in mappings)
 
-    return lambda df: df.rename(columns=name_map)
+def _parse_mapping(
+    mapping,
+):
+    (
+        old_name,
+        new_name,
+    ) = mapping.split(" = ")
+    return (
+        old_name,
+        new_name,
+    )
 
 
-def arrange(*columns):
+def arrange(*columns, reblock=True):
     """Returns a lambda function that can be used to rearrange the rows of a pandas DataFrame.
 
+    The sort is stable: rows with equal keys keep their original order.
+
     Args:
         *columns (str): The names of the columns to use for sorting the rows, along with the
             desired sort order (ascending or descending). Columns should be specified in the
             format "column_name [desc]".
+        reblock (bool, optional): Whether to store the columns of the sorted DataFrame contiguously in memory, when the DataFrame is numeric-only and wide and they are not. Defaults to True.
 
     Returns:
         function: A lambda function that takes a DataFrame as input and returns a new DataFrame
             with the rows sorted according to the specified columns.
     """
 
-    def parse_column(column):
-        if column.endswith(" desc"):
-            return (
-                column[:-5],
-                False,
-            )
-        else:
-            return (
-                column,
-                True,
-            )
-
-    def sort_df(df):
-        sorted_columns = [parse_column(c) for c in columns]
-        return df.sort_values(
-            by=[c[0] for c in sorted_columns],
-            ascending=[c[1] for c in sorted_columns],
+    sorted_columns = [_parse_sort_column(c) for c in columns]
+    by, ascending = map(list, zip(*sorted_columns)) if sorted_columns else ([], [])
+
+    return Verb(
+        "arrange",
+        functools.partial(
+            _arrange,
+            sorted_columns=sorted_columns,
+            by=by,
+            ascending=ascending,
+            reblock=reblock,
+        ),
+        args=columns,
+        kwargs={"reblock": reblock},
+        is_noop=not columns,
+    )
+
+
+def _arrange(df, sorted_columns, by, ascending, reblock):
+    if not by:
+        return df
+    if by and _numeric_columns(df, by):
+        # A single stable sort over all the keys, the last one passed to lexsort being the primary key
+        order = np.lexsort(
+            [
+                _sort_key(df[column].to_numpy(), asc)
+                for column, asc in reversed(sorted_columns)
+            ]
+        )
+        result = df.iloc[order]
+    else:
+        result = df.sort_values(
+            by=by,
+            ascending=ascending,
+            kind="stable",
         )
+    return _reblock(result) if reblock else result
 
-    return sort_df
+
+def _numeric_columns(df, columns):
+    """Returns whether all the columns are NumPy-backed numeric columns of the DataFrame."""
+    if not df.columns.is_unique:
+        return False
+    for column in columns:
+        if column not in df.columns:
+            # Index levels are sorted by pandas
+            return False
+        dtype = df[column].dtype
+        if not isinstance(dtype, np.dtype) or dtype.kind not in "iuf":
+            return False
+    return True
+
+
+def _sort_key(values, ascending):
+    if ascending:
+        return values
+    # Inverting the bits reverses the order of integers without overflowing, and NaNs stay last
+    return ~values if values.dtype.kind in "iu" else -values
+
+
+def _parse_sort_column(column):
+    if column.endswith(" desc"):
+        return (
+            column[:-5],
+            False,
+        )
+    else:
+        return (
+            column,
+            True,
+        )
 
 
 def mutate(**transformations):
@@ -120,44 +509,219 @@ def mutate(**transformations):
 
     The transformation functions operate on the entire DataFrame, which is passed as a single argument to the function. This makes it suitable for transformations that uses pd.Series methods.
 
+    Transformations can also be strings, evaluated with `DataFrame.eval` (e.g. `"hp / wt"`), using `numexpr` when it is installed. Consecutive string transformations are evaluated together, in a single call; local variables are not available in the expressions.
+
     If you need individual row-level processing, plese refer to the `mutate_row` function.
 
     Args:
-        **transformations: A dictionary of new column names and transformation functions.
+        **transformations: A dictionary of new column names and transformation functions or strings.
 
     Returns:
         A transformed Pandas DataFrame.
     """
 
-    def _mutate(df):
-        for new_column, transformation in transformations.items():
-            df[new_column] = transformation(df)
+    return Verb(
+        "mutate",
+        functools.partial(
+            _apply_transformations, transformations=tuple(transformations.items())
+        ),
+        kwargs=transformations,
+        is_noop=not transformations,
+    )
+
+
+def _apply_transformations(df, transformations):
+    """Adds the columns of a sequence of (new column, transformation) pairs to a DataFrame."""
+    if not transformations:
         return df
+    expressions = []
+    for new_column, transformation in transformations:
+        if isinstance(transformation, str):
+            expressions.append((new_column, transformation))
+            continue
+        _evaluate(df, expressions)
+        expressions = []
+        df[new_column] = transformation(df)
+    _evaluate(df, expressions)
+    return df
+
+
+def _evaluate(df, expressions):
+    """Adds the columns of a sequence of (new column, expression) pairs to a DataFrame, with a single eval."""
+    if not expressions:
+        return
+    if all(column.isidentifier() for column, _ in expressions):
+        df.eval(
+            "\n".join(f"{column} = {expression}" for column, expression in expressions),
+            engine=_eval_engine(df),
+            local_dict={},
+            inplace=True,
+        )
+    else:
+        # eval cannot assign to columns that are not valid identifiers
+        for column, expression in expressions:
+            df[column] = df.eval(expression, engine=_eval_engine(df), local_dict={})
+
+
+def _eval_engine(df):
+    """Returns the fastest engine available for evaluating expressions on a DataFrame with DataFrame.eval."""
+    # numexpr does not support extension dtypes other than strings (e.g. Arrow-backed columns)
+    if _numexpr_available() and not any(
+        isinstance(dtype, pd.api.extensions.ExtensionDtype)
+        and not pd.api.types.is_string_dtype(dtype)
+        for dtype in df.dtypes
+    ):
+        return "numexpr"
+    return "python"
 
-    return _mutate
 
+@functools.lru_cache(1)
+def _numexpr_available():
+    try:
+        import numexpr  # noqa: F401
+    except ImportError:
+        return False
+    return True
 
-def mutate_row(**transformations):
+
+def mutate_row(row_as_series=False, **transformations):
     """
     Applies transformations to columns of a Pandas DataFrame at a row-level.
 
     This means that the transformation functions are applied to each row of the DataFrame, allowing for row-level processing.
 
+    Rows are passed to the transformation functions as named tuples, so their values are accessed as attributes (e.g. `lambda r: r.hp / r.wt`). Column names that are not valid Python identifiers are renamed positionally (`_1`, `_2`, ...); pass `row_as_series=True` to receive each row as a pd.Series indexed by the column names instead, at the cost of a slower iteration.
+
+    The rows are read once and shared by all the transformations, so columns created within the same call are not visible to the other transformations: chain another `mutate_row` if you need them.
+
     If you need transformations that operate on the entire DataFrame, plese refer to the `mutate` function.
 
     Args:
+        row_as_series (bool, optional): Whether to pass each row as a pd.Series instead of a named tuple. Defaults to False.
         **transformations: A dictionary of new column names and transformation functions.
 
     Returns:
         A transformed Pandas DataFrame.
     """
 
-    def _mutate(df):
-        for new_column, transformation in transformations.items():
-            df[new_column] = df.apply(transformation, axis=1)
+    return Verb(
+        "mutate_row",
+        functools.partial(
+            _mutate_row,
+            transformations=tuple(transformations.items()),
+            row_as_series=row_as_series,
+        ),
+        kwargs=dict(transformations, row_as_series=row_as_series),
+        is_noop=not transformations,
+    )
+
+
+def _mutate_row(df, transformations, row_as_series):
+    if not transformations:
         return df
+    # Rows are materialized once and shared by all the transformations
+    if row_as_series:
+        # Like with DataFrame.apply, each Series is named after the index label of its row
+        rows = [
+            pd.Series(values, index=df.columns, name=label)
+            for label, *values in df.itertuples(index=True, name=None)
+        ]
+    else:
+        rows = list(df.itertuples(index=False, name="Row"))
+    for new_column, transformation in transformations:
+        df[new_column] = [transformation(row) for row in rows]
+    return df
+
+
+def mutate_numba(**transformations):
+    """
+    Applies element-wise numeric transformations to columns of a Pandas DataFrame, compiled with Numba.
+
+    Each transformation is a function taking scalars, whose argument names are the names of the columns it reads (e.g. `lambda hp, wt: hp / wt`). The function is compiled once into a parallel loop over the underlying NumPy arrays, so the expression is evaluated in a single pass without temporary arrays. The kernels are cached, and reused whenever the same function is applied again.
+
+    The dtype of each new column is the return type inferred by Numba for the dtypes of the input columns. Like with `mutate`, each transformation can use the columns created before it.
+
+    Requires Numba (`pip install viper-df[numba]`).
+
+    Args:
+        **transformations: A dictionary of new column names and scalar functions.
+
+    Returns:
+        A transformed Pandas DataFrame.
+    """
 
-    return _mutate
+    return Verb(
+        "mutate_numba",
+        functools.partial(
+            _mutate_numba, transformations=tuple(transformations.items())
+        ),
+        kwargs=transformations,
+        is_noop=not transformations,
+    )
+
+
+def _mutate_numba(df, transformations):
+    for new_column, func in transformations:
+        names = list(inspect.signature(func).parameters)
+        arrays = [df[name].to_numpy() for name in names]
+        kernel, scalar_func = _numba_kernel(func, len(arrays))
+        out = np.empty(len(df), dtype=_numba_return_dtype(scalar_func, arrays))
+        kernel(out, *arrays)
+        df[new_column] = out
+    return df
+
+
+def _numba_return_dtype(scalar_func, arrays):
+    """Returns the dtype of the values returned by a compiled scalar function, as inferred by Numba for the input arrays."""
+    import numba
+    from numba.np.numpy_support import as_dtype
+
+    argtypes = tuple(numba.typeof(array).dtype for array in arrays)
+    scalar_func.compile(argtypes)
+    return as_dtype(scalar_func.overloads[argtypes].signature.return_type)
+
+
+# Compiled Numba kernels of the functions passed to mutate_numba, dropped with their function
+_NUMBA_KERNELS = weakref.WeakKeyDictionary()
+
+
+def _numba_kernel(func, nargs):
+    # The kernel and the compiled scalar function, Numba keeping one specialization per combination of input dtypes
+    try:
+        return _NUMBA_KERNELS[func]
+    except KeyError:
+        pass
+    except TypeError:
+        # Callables that cannot be weakly referenced are compiled at each call
+        return _compile_numba_kernel(func, nargs)
+    kernel = _NUMBA_KERNELS[func] = _compile_numba_kernel(func, nargs)
+    return kernel
+
+
+def _compile_numba_kernel(func, nargs):
+    import numba
+
+    if isinstance(func, types.FunctionType):
+        # The kernel must not reference the function it is cached for, or the function would never be released
+        func = types.FunctionType(
+            func.__code__,
+            func.__globals__,
+            func.__name__,
+            func.__defaults__,
+            func.__closure__,
+        )
+
+    arrays = [f"a{i}" for i in range(nargs)]
+    source = (
+        f"def kernel(out, {', '.join(arrays)}):\n"
+        f"    for i in prange(out.shape[0]):\n"
+        f"        out[i] = func({', '.join(f'{a}[i]' for a in arrays)})\n"
+    )
+    scalar_func = numba.njit(func)
+    namespace = {"prange": numba.prange, "func": scalar_func}
+    exec(source, namespace)
+    # fastmath is left off, as it would not preserve the NaN semantics of pandas
+    return numba.njit(parallel=True)(namespace["kernel"]), scalar_func
 
 
 def distinct(*columns, keep_all=False):
@@ -172,13 +736,24 @@ def distinct(*columns, keep_all=False):
         function: A lambda function that takes a DataFrame as input and returns a new DataFrame containing only the unique rows based on the specified columns.
     """
 
-    def _distinct(df):
-        if keep_all:
-            return df.drop_duplicates(subset=columns)
-        else:
-            return df[list(columns)].drop_duplicates()
+    return Verb(
+        "distinct",
+        functools.partial(_distinct, subset=list(columns), keep_all=keep_all),
+        args=columns,
+        kwargs={"keep_all": keep_all},
+    )
 
-    return _distinct
+
+def _distinct(df, subset, keep_all):
+    if not subset:
+        # Without columns to compare, all the rows are kept, like drop_duplicates on no columns
+        return df if keep_all else df[[]]
+    # Only the subset columns are hashed, and rows and columns are then taken in one step
+    mask = ~df.duplicated(subset=subset).to_numpy()
+    if keep_all:
+        return df.loc[mask]
+    else:
+        return df.loc[mask, subset]
 
 
 # group_by and summarize ---------
@@ -188,35 +763,138 @@ def group_by(*columns):
     Args:
         *columns (str): The names of the columns to group the rows by.
 
+    The groups are only computed by the verb that follows: `summarize` groups and aggregates the rows in a single call, and any other function receives the `DataFrameGroupBy` object when it accesses an attribute of the grouped DataFrame.
+
     Returns:
         function: A lambda function that takes a DataFrame as input and returns a new DataFrame with the rows grouped according to the specified columns."
     """
 
-    def _group_by(df):
-        return df.groupby(list(columns))
+    return Verb(
+        "group_by", functools.partial(_Grouped, columns=list(columns)), args=columns
+    )
 
-    return _group_by
+
+class _Grouped:
+    """A DataFrame waiting for `summarize` to aggregate it by the grouping columns.
+
+    Attributes, items and iteration are delegated to the `DataFrameGroupBy` object, built at the first access.
+    """
+
+    def __init__(self, df, columns):
+        self.df = df
+        self.columns = columns
+        self._groupby = None
+
+    def groupby(self):
+        if self._groupby is None:
+            self._groupby = self.df.groupby(self.columns)
+        return self._groupby
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.groupby(), name)
+
+    def __getitem__(self, key):
+        return self.groupby()[key]
+
+    def __iter__(self):
+        return iter(self.groupby())
+
+    def __len__(self):
+        return len(self.groupby())
 
 
 def summarize(*aggregations):
     """Returns a lambda function that can be used to apply aggregations to the groups of a pandas DataFrame.
 
     Args:
-        *aggregations (str): A string in the format "column = aggregation_function()" specifying the column to aggregate and the aggregation function to use.
+        *aggregations (str): A string in the format "column = aggregation_function()" specifying the column to aggregate and the aggregation function to use. The aggregated column can also be given as argument, to store the result in a new column: "new_column = aggregation_function(column)". The supported aggregation functions are: count, first, last, max, mean, median, min, nunique, prod, size, std, sum and var. `size` counts the rows of each group, and does not need an aggregated column: "n = size()".
 
     Returns:
         function: A lambda function that takes a DataFrame as input and returns a new DataFrame with the specified aggregations applied to each group.
     """
 
-    def _summarize(df):
-        aggregations_dict = {}
-        for aggregation in aggregations:
-            col, func = aggregation.split(" = ")
-            func_name, col_name = func[:-1].split("(")
-            aggregations_dict[col] = func_name
-        return df.agg(aggregations_dict)
+    parsed_aggregations = [_parse_aggregation(a) for a in aggregations]
+    named_aggregations = {
+        col: pd.NamedAgg(column=input_col, aggfunc=func_name)
+        for col, input_col, func_name in parsed_aggregations
+    }
+
+    return Verb(
+        "summarize",
+        functools.partial(
+            _summarize,
+            parsed_aggregations=parsed_aggregations,
+            named_aggregations=named_aggregations,
+        ),
+        args=aggregations,
+    )
+
+
+def _summarize(df, parsed_aggregations, named_aggregations):
+    if isinstance(df, _Grouped):
+        # The rows are grouped and aggregated in a single call, the groups staying sorted by their keys
+        named_aggregations = _count_rows_of(named_aggregations, df.columns[0])
+        return _reblock(
+            df.df.groupby(df.columns, observed=True).agg(**named_aggregations)
+        )
+    if isinstance(df, pd.DataFrame):
+        # Without groups, each aggregation reduces a column to a single value
+        return pd.Series(
+            {
+                col: len(df) if func_name == "size" else df[input_col].agg(func_name)
+                for col, input_col, func_name in parsed_aggregations
+            }
+        )
+    keys = df.keys if isinstance(df.keys, list) else [df.keys]
+    if isinstance(keys[0], str):
+        named_aggregations = _count_rows_of(named_aggregations, keys[0])
+    # All the aggregations are computed in a single pass over the groups
+    return _reblock(df.agg(**named_aggregations))
+
+
+def _count_rows_of(named_aggregations, key):
+    """Counts the rows of the groups with the values of a grouping column, which always exists."""
+    return {
+        col: (
+            pd.NamedAgg(column=key, aggfunc="size")
+            if aggregation.aggfunc == "size"
+            else aggregation
+        )
+        for col, aggregation in named_aggregations.items()
+    }
+
+
+def _reblock(df):
+    """Copies a wide, numeric-only DataFrame whose columns are strided in memory.
+
+    Some pandas operations (e.g. groupby aggregations) return 2D blocks in Fortran order, where the values of each column are not contiguous, which slows down all the column-wise operations that follow. A deep copy stores the blocks back in C order, consolidated by dtype.
+    """
+    if not isinstance(df, pd.DataFrame) or df.shape[1] <= REBLOCK_MIN_COLUMNS:
+        return df
+    blocks = getattr(getattr(df, "_mgr", None), "blocks", None)
+    if blocks is None or not all(
+        pd.api.types.is_numeric_dtype(dtype) for dtype in df.dtypes
+    ):
+        return df
+    if all(
+        not isinstance(block.values, np.ndarray) or block.values.flags.c_contiguous
+        for block in blocks
+    ):
+        return df
+    return df.copy()
+
 
-    return _summarize
+def _parse_aggregation(aggregation):
+    col, func = aggregation.split(" = ")
+    func_name, col_name = func[:-1].split("(")
+    if func_name not in AGGREGATIONS:
+        raise ValueError(
+            f"Invalid aggregation function '{func_name}'. "
+            f"Must be one of {', '.join(map(repr, AGGREGATIONS))}."
+        )
+    return col, col_name or col, func_name
 
 
 # Joins -----------
@@ -225,6 +903,8 @@ def left_join(right, by):
 
     This function allows the user to specify the right DataFrame and the columns to join on. The left DataFrame is passed as input to the returned lambda function.
 
+    The right DataFrame is indexed by the join columns at the first join, and the index is reused when the returned function is applied again, so the right DataFrame should not be modified in the meantime.
+
     Args:
         right (pandas.DataFrame): The DataFrame to join with the left DataFrame.
         by (str or list): The name(s) of the column(s) to use for the merge. Columns must have the same name in both the left and right DataFrames.
@@ -233,14 +913,39 @@ def left_join(right, by):
         function: A lambda function that takes a left DataFrame as input and returns a new DataFrame containing the left join of the left and right DataFrames.
     """
 
-    def join(left):
+    keys = [by] if isinstance(by, str) else list(by)
+    # The right DataFrame indexed by the keys, built at the first join and reused by the following ones
+    indexed = {}
+    return Verb(
+        "left_join",
+        functools.partial(_left_join, right=right, keys=keys, indexed=indexed),
+        args=(right, by),
+    )
+
+
+def _left_join(left, right, keys, indexed):
+    arrow = left.attrs.get(ARROW_ATTR, False)
+    if arrow not in indexed:
+        # Joining Arrow-backed DataFrames with an Arrow-backed right side keeps the key dtypes aligned
+        indexed_right = (_to_arrow_backend(right) if arrow else right).set_index(keys)
+        indexed[arrow] = indexed_right if indexed_right.index.is_unique else None
+
+    if indexed[arrow] is None:
         return left.merge(
             right,
-            on=by,
+            on=keys,
             how="left",
         )
-
-    return join
+    # The hash table of the right index is cached by pandas, and reused at each join
+    result = left.merge(
+        indexed[arrow],
+        left_on=keys,
+        right_index=True,
+        how="left",
+        sort=False,
+    )
+    result.index = pd.RangeIndex(len(result))
+    return result
 
 
 def anti_join(right, by):
@@ -256,10 +961,32 @@ def anti_join(right, by):
         function: A lambda function that takes a left DataFrame as input and returns a new DataFrame containing the rows from the left DataFrame that do not match any rows in the right DataFrame based on the specified columns.
     """
 
-    def join(left):
+    keys = [by] if isinstance(by, str) else list(by)
+    # The unique keys of the right DataFrame, extracted at the first join and reused by the following ones
+    unique_keys = []
+    return Verb(
+        "anti_join",
+        functools.partial(
+            _anti_join, right=right, by=by, keys=keys, unique_keys=unique_keys
+        ),
+        args=(right, by),
+    )
+
+
+def _anti_join(left, right, by, keys, unique_keys):
+    if isinstance(by, str) and len(right) < ISIN_MAX_ROWS:
         return left[~left[by].isin(right[by])]
 
-    return join
+    if not unique_keys:
+        unique_keys.append(right[keys].drop_duplicates())
+    # A left merge keeps the order of the left rows, and the right keys are unique
+    merged = left[keys].merge(
+        unique_keys[0],
+        on=keys,
+        how="left",
+        indicator=MERGE_INDICATOR,
+    )
+    return left[(merged[MERGE_INDICATOR] == "left_only").to_numpy()]
 
 
 def tail(n=6):
@@ -273,10 +1000,11 @@ def tail(n=6):
         function: A lambda function that takes a DataFrame as input and returns a new DataFrame containing the last n rows.
     """
 
-    def _tail(df):
-        return df.tail(n)
+    return Verb("tail", functools.partial(_tail, n=n), args=(n,))
+
 
-    return _tail
+def _tail(df, n):
+    return df.tail(n)
 
 
 def head(n=5):
@@ -290,30 +1018,124 @@ def head(n=5):
         function: A lambda function that takes a DataFrame as input and returns a new DataFrame containing the first n rows.
     """
 
-    def _head(df):
-        return df.head(n)
+    return Verb("head", functools.partial(_head, n=n), args=(n,))
+
 
-    return _head
+def _head(df, n):
+    return df.head(n)
 
 
-def to_csv(filename, index=False, **kwargs):
+def to_csv(filename, index=False, engine="pandas", **kwargs):
     """
     Returns a lambda function that saves a pandas DataFrame to a CSV file.
 
+    With the 'pyarrow' engine, the file is written by the multi-threaded CSV writer of pyarrow, and compressed on the fly if its name ends with '.gz'. Its output differs slightly from the pandas one: strings are quoted, booleans are lowercase, floats with integer values have no decimal part and datetimes are written in ISO 8601 format. The 'pandas' engine is used instead when pyarrow is not installed, or when the DataFrame or the options (other than `sep` and `header`) are not supported by pyarrow.
+
     Args:
         filename (str): The name of the file to save the DataFrame to.
         index (bool, optional): Whether or not to write row names (index). Defaults to False.
+        engine (str, optional): The engine writing the file. Can be 'pandas' or 'pyarrow'. Defaults to 'pandas'.
         **kwargs: Additional keyword arguments to be passed to pandas.DataFrame.to_csv() function.
 
     Returns:
         function: A lambda function that takes a DataFrame as input and saves it to a CSV file.
     """
 
-    def _to_csv(df):
-        df.to_csv(filename, index=index, **kwargs)
+    if engine not in ["pandas", "pyarrow"]:
+        raise ValueError("Invalid engine. Must be 'pandas' or 'pyarrow'.")
+
+    return Verb(
+        "to_csv",
+        functools.partial(
+            _to_csv, filename=filename, index=index, engine=engine, kwargs=kwargs
+        ),
+        args=(filename,),
+        kwargs=dict(kwargs, index=index, engine=engine),
+    )
+
+
+def _to_csv(df, filename, index, engine, kwargs):
+    if engine == "pyarrow" and _to_csv_pyarrow(df, filename, index, kwargs):
         return df
+    df.to_csv(filename, index=index, **kwargs)
+    return df
+
+
+def _pandas_csv_only(dtype):
+    """Returns whether pyarrow cannot write the values of a dtype like pandas does (e.g. durations as integers)."""
+    if isinstance(dtype, pd.ArrowDtype):
+        import pyarrow as pa
+
+        return pa.types.is_duration(dtype.pyarrow_dtype)
+    return isinstance(dtype, (pd.IntervalDtype, pd.PeriodDtype)) or (
+        isinstance(dtype, np.dtype) and dtype.kind in "mc"
+    )
+
+
+def _to_csv_pyarrow(df, filename, index, kwargs):
+    """Writes a DataFrame to a CSV file with pyarrow, returning False if it is not supported."""
+    if index or not set(kwargs).issubset(PYARROW_CSV_OPTIONS):
+        return False
+    if not isinstance(kwargs.get("header", True), bool):
+        # pyarrow cannot write column aliases
+        return False
+    if not isinstance(filename, (str, os.PathLike)):
+        return False
+    path = os.fspath(filename)
+    if path.lower().endswith(PANDAS_COMPRESSION_EXTENSIONS):
+        return False
+    try:
+        import pyarrow as pa
+        import pyarrow.csv
+    except ImportError:
+        return False
+
+    if isinstance(df.columns, pd.MultiIndex) or not df.columns.is_unique:
+        # pyarrow writes a single header line, with unique names
+        return False
+    if any(_pandas_csv_only(dtype) for dtype in df.dtypes):
+        return False
+
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowException, ValueError):
+        return False
+    options = pyarrow.csv.WriteOptions(
+        batch_size=PYARROW_CSV_BATCH_SIZE,
+        **{PYARROW_CSV_OPTIONS[key]: value for key, value in kwargs.items()},
+    )
+    try:
+        if path.lower().endswith(".gz"):
+            with pa.CompressedOutputStream(path, "gzip") as stream:
+                pyarrow.csv.write_csv(table, stream, write_options=options)
+        else:
+            pyarrow.csv.write_csv(table, path, write_options=options)
+    except pa.ArrowInvalid:
+        # Some types (e.g. structs) cannot be written to CSV, the file is then rewritten by pandas
+        return False
+    return True
 
-    return _to_csv
+
+def to_numpy_backend():
+    """
+    Returns a lambda function that converts the Arrow-backed columns of a pandas DataFrame back to NumPy dtypes.
+
+    This is the reverse of `pipeline(..., arrow=True)`: integer columns with missing values become float columns, and string columns become the default pandas string columns.
+
+    Returns:
+        function: A lambda function that takes a DataFrame as input and returns a new DataFrame whose columns are backed by NumPy arrays.
+    """
+
+    return Verb("to_numpy_backend", _to_numpy_backend)
+
+
+def _to_numpy_backend(df):
+    result = df.copy()
+    for i, dtype in enumerate(df.dtypes):
+        if isinstance(dtype, pd.ArrowDtype):
+            result.isetitem(i, df.iloc[:, i].to_numpy())
+    result.attrs.pop(ARROW_ATTR, None)
+    return result
 
 
 def squeeze():
@@ -324,10 +1146,11 @@ def squeeze():
         function: A lambda function that takes a DataFrame as input and returns a pandas Series if the DataFrame has only one column or one row, otherwise returns the original DataFrame.
     """
 
-    def _squeeze(df):
-        return df.squeeze()
+    return Verb("squeeze", _squeeze)
+
 
-    return _squeeze
+def _squeeze(df):
+    return df.squeeze()
 
 
 def filter_index(custom=None, mode="custom"):
@@ -345,14 +1168,19 @@ def filter_index(custom=None, mode="custom"):
     if mode not in ["custom", "max", "min"]:
         raise ValueError("Invalid mode. Must be 'custom', 'max', or 'min'.")
 
-    def _filter_index(df):
-        if mode == "custom":
-            if custom is None:
-                raise ValueError("Custom value must be provided when mode is 'custom'.")
-            return df.loc[df.index == custom]
-        elif mode == "max":
-            return df.loc[df.index == df.index.max()]
-        elif mode == "min":
-            return df.loc[df.index == df.index.min()]
-
-    return _filter_index
+    return Verb(
+        "filter_index",
+        functools.partial(_filter_index, custom=custom, mode=mode),
+        kwargs={"custom": custom, "mode": mode},
+    )
+
+
+def _filter_index(df, custom, mode):
+    if mode == "custom":
+        if custom is None:
+            raise ValueError("Custom value must be provided when mode is 'custom'.")
+        return df.loc[df.index == custom]
+    elif mode == "max":
+        return df.loc[df.index == df.index.max()]
+    elif mode == "min":
+        return df.loc[df.index == df.index.min()]